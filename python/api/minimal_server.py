@@ -37,6 +37,19 @@ async def read_root():
 # ===================== #
 
 if __name__ == "__main__":
+    import os
     import uvicorn
 
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    # uvloop and httptools come with uvicorn[standard] (included in fastapi[all]),
+    # WEB_CONCURRENCY sets the number of worker processes (one per CPU by default).
+    # With more than one worker the app is passed as an import string so that each
+    # worker imports its own instance of it.
+    uvicorn.run(
+        f"{os.path.splitext(os.path.basename(__file__))[0]}:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", 8000)),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )
@@ -1,5 +1,7 @@
-from sqlalchemy.orm import Session
-from typing import TypeVar, List, Any, Optional
+from sqlalchemy import delete, insert, inspect, select, update
+from sqlalchemy.orm import MANYTOMANY, ONETOMANY
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import TypeVar, List, Any, AsyncIterator, Optional, Sequence
 
 T = TypeVar("T")
 
@@ -13,48 +15,51 @@ class SQLAlchemySQLDbAdapter:
     Example
     -------
     ```python
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
     from ai_agent.domain.entities import Questionnaire
     from ai_agent.infrastructure.adapters import SQLAlchemySQLDbAdapter
-    engine = create_engine('sqlite:///example.db')
+    engine = create_async_engine('sqlite+aiosqlite:///example.db')
 
 
-    Session = sessionmaker(bind=engine)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
 
-    with Session() as session:
+    async with Session() as session:
         db_adapter = SQLAlchemySQLDbAdapter(session)
 
         # Use db_adapter for CRUD operations
-        db_adapter.add_value(Questionnaire(title="Sample Questionnaire", status="draft"))
-        db_adapter.add_values(Questionnaire, [new_row])
-        db_adapter.update_values(Questionnaire, 1, title="Updated Title")
-        db_adapter.read_value(Questionnaire, id=1)
-        db_adapter.read_values(Questionnaire, status="draft")
-        db_adapter.read_all_values(Questionnaire)
-        db_adapter.delete_value(Questionnaire, id=1)
+        await db_adapter.add_value(Questionnaire(title="Sample Questionnaire", status="draft"))
+        await db_adapter.add_values(Questionnaire, [new_row])
+        await db_adapter.update_values(Questionnaire, 1, title="Updated Title")
+        await db_adapter.read_value(Questionnaire, id=1)
+        await db_adapter.read_values(Questionnaire, status="draft")
+        await db_adapter.read_all_values(Questionnaire)
+        await db_adapter.delete_value(Questionnaire, id=1)
 
     ```
+
+    NOTE: create the session with ``expire_on_commit=False`` (as above), the rows returned
+    by the adapter are then still usable after the commit without being re-loaded
+    from the database when their attributes are accessed.
     """
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         self.session = db
 
-    def __enter__(self):
+    async def __aenter__(self):
         return self
 
-    def __exit__(self, *args) -> None:
+    async def __aexit__(self, *args) -> None:
         """close the session to allow other processes to access the database"""
-        self.session.close()
+        await self.session.close()
 
-    def add_value(self, new_row: T) -> T:
+    async def add_value(self, new_row: T) -> T:
         """add_value this method will add a row to the given table. i.e.
 
         ## Example
         ```python
         new_row = User(name='Alice', age=30)
         session = SQLAlchemySQLDbAdapter()
-        session.add_value(new_row)
+        await session.add_value(new_row)
         ```
 
         Parameters
@@ -70,23 +75,26 @@ class SQLAlchemySQLDbAdapter:
         """
         # Insert a new row into the table
         self.session.add(new_row)
-        self.session.commit()
-        self.session.refresh(new_row)
+        await self.session.commit()
+        await self.session.refresh(new_row)
         return new_row
 
-    def add_values(self, class_table: type[T], new_row: List[T]) -> List[T]:
-        """add_values this method will add a row to the given table. i.e.
+    async def add_values(self, class_table: type[T], new_row: List[T]) -> List[T]:
+        """add_values this method will add multiple rows to the given table using a single
+        bulk INSERT statement and return only the inserted rows. i.e.
 
         ## Example
         ```python
         new_row = User(name='Alice', age=30)
         session = SQLAlchemySQLDbAdapter()
-        session.add_values(new_row)
+        await session.add_values(User, [new_row])
         ```
 
         Parameters
         ---
 
+        class_table type
+            this is the name of the class of the table i.e. User
         new_row List[T]
             this is the instance of the table class that we want to insert
             i.e. new_user = User(name='Alice')
@@ -94,13 +102,37 @@ class SQLAlchemySQLDbAdapter:
         Returns
         ---
         result: List[T]
+            the inserted rows, including the values generated by the database (i.e. id)
+
+        Notes
+        ---
+        the rows are inserted as an ORM bulk INSERT, therefore the unit of work is bypassed
+        and ORM events (i.e. before_insert) and relationship cascades are not triggered.
+        when the database does not support INSERT..RETURNING (i.e. MySQL, SQLite < 3.35)
+        the rows are added through the unit of work and flushed instead.
         """
-        # Insert a new row into the table
-        self.session.add_all(new_row)
-        self.session.commit()
-        return self.read_all_values(class_table)
+        if not new_row:
+            return []
+        if not self.session.get_bind().dialect.insert_returning:
+            self.session.add_all(new_row)
+            await self.session.flush()
+            await self.session.commit()
+            return new_row
+        # only send the column values which have been set on each instance
+        columns = [column.key for column in inspect(class_table).column_attrs]
+        payload = [
+            {key: row.__dict__[key] for key in columns if key in row.__dict__}
+            for row in new_row
+        ]
+        result = await self.session.scalars(
+            insert(class_table).returning(class_table, sort_by_parameter_order=True),
+            payload,
+        )
+        inserted_rows = list(result.all())
+        await self.session.commit()
+        return inserted_rows
 
-    def update_values(
+    async def update_values(
         self, class_table: type[T], row_id: Any, **kwargs: Any
     ) -> T | None:
         """This method updates all the values of a record in the database
@@ -109,7 +141,7 @@ class SQLAlchemySQLDbAdapter:
         ```python
         updated_row = Username="Daniel",email="email@gmail.com")
         session = SQLAlchemySQLDbAdapter()
-        session.update_values(User, updated_row.dict(),name="Kesler")
+        await session.update_values(User, updated_row.dict(),name="Kesler")
         ```
 
         Parameters
@@ -125,22 +157,11 @@ class SQLAlchemySQLDbAdapter:
         Returns
         -------
         Any
-            the updated record
+            the updated record, or None if not found
         """
-        row = self.session.query(class_table).filter_by(id=row_id).first()
-
-        # update the properties dynamically based on a dictionary of key-value pairs
-        for key, value in kwargs.items():
-            print(key, value)
-            setattr(row, key, value)
-
-        self.session.flush()
-        self.session.refresh(row)
-        # commit the changes
-        self.session.commit()
-        return row
+        return await self._update_row(class_table, kwargs, id=row_id)
 
-    def update_value(
+    async def update_value(
         self, class_table: type[T], key: str, value: Any, **kwargs: Any
     ) -> Optional[T]:
         """update_value will update a record in the table
@@ -148,7 +169,7 @@ class SQLAlchemySQLDbAdapter:
         ## Example
         ```python
         # this line will update the record email from Kesler to John
-        session.update_value(database.User, "email", "John", email="Kesler")
+        await session.update_value(database.User, "email", "John", email="Kesler")
         ```
 
         Parameters
@@ -168,24 +189,63 @@ class SQLAlchemySQLDbAdapter:
         Returns
         -------
         Optional[T]
-          return the updated record, or None if not found
+          return the updated record, or None if not found.
+          NOTE: only the first record matching kwargs is updated
         """
-        row = self.session.query(class_table).filter_by(**kwargs).first()
-        if row is None:
-            return None
+        return await self._update_row(class_table, {key: value}, **kwargs)
 
-        setattr(row, key, value)
-        self.session.commit()
-        self.session.refresh(row)
+    async def _update_row(
+        self, class_table: type[T], values: dict[str, Any], **kwargs: Any
+    ) -> Optional[T]:
+        """update the first row identified by kwargs with a single UPDATE ... RETURNING
+        statement and return it. Databases which do not support RETURNING
+        (i.e. SQLite < 3.35) and tables with a composite primary key fall back to
+        reading the row and updating it through the ORM.
+        """
+        if not values:
+            # nothing to update, an UPDATE without a SET clause is invalid SQL
+            return await self.read_value(class_table, **kwargs)
+
+        primary_key = inspect(class_table).primary_key
+        if (
+            not self.session.get_bind().dialect.update_returning
+            or len(primary_key) != 1
+        ):
+            result = await self.session.execute(select(class_table).filter_by(**kwargs))
+            row = result.scalars().first()
+            if row is None:
+                return None
+            for key, value in values.items():
+                setattr(row, key, value)
+            await self.session.commit()
+            await self.session.refresh(row)
+            return row
+
+        # only update the first matching row, located through its primary key
+        first_row_id = (
+            select(primary_key[0]).filter_by(**kwargs).limit(1).scalar_subquery()
+        )
+        result = await self.session.scalars(
+            update(class_table)
+            .where(primary_key[0] == first_row_id)
+            .values(**values)
+            .returning(class_table)
+            .execution_options(populate_existing=True)
+        )
+        row = result.first()
+        await self.session.commit()
         return row
 
-    def read_value(self, class_table: type[T], **kwargs: Any) -> Optional[T]:
+    async def read_value(
+        self, class_table: type[T], options: Sequence[Any] = (), **kwargs: Any
+    ) -> Optional[T]:
         """read_value this will read a specific value (row) from the given table.
 
         # Example
         ```python
         session = SQLAlchemySQLDbAdapter()
-        session.read_value(User,name="Mark")
+        await session.read_value(User,name="Mark")
+        await session.read_value(User, options=(selectinload(User.orders),), name="Mark")
         ```
 
         Parameters
@@ -193,6 +253,8 @@ class SQLAlchemySQLDbAdapter:
 
         class_table type
             this is the name of the class of the table i.e. User
+        options Sequence
+            loader options applied to the query i.e. selectinload(User.orders)
         **kwargs tuple
             this is the key value pair that we want to use for our query i.e.
             name='Paul'
@@ -203,20 +265,19 @@ class SQLAlchemySQLDbAdapter:
             this will return all the records which meet the given conditions, i.e.
             if we are looking for name='Paul' it will return all the rows with the name 'Paul'
         """
-        row = self.session.query(class_table).filter_by(**kwargs).first()
-        if row is None:
-            return None
-        self.session.refresh(row)
-        return row
+        result = await self.session.execute(
+            select(class_table).options(*options).filter_by(**kwargs)
+        )
+        return result.scalars().first()
 
-    def read_values(self, class_table: type[T], **kwargs: Any) -> List[T]:
+    async def read_values(self, class_table: type[T], **kwargs: Any) -> List[T]:
         """read_values gets all the values which have the specific combinations of
         keys and values passed
 
         # Example
         ```python
         sesion = SQLAlchemySQLDbAdapter()
-        all_users_named_kesler = session.read_all_values(User,name="kesler")
+        all_users_named_kesler = await session.read_values(User,name="kesler")
         ```
 
         Parameters
@@ -231,15 +292,59 @@ class SQLAlchemySQLDbAdapter:
         ---
         result: Any
         """
-        return self.session.query(class_table).filter_by(**kwargs).all()
+        result = await self.session.execute(select(class_table).filter_by(**kwargs))
+        return list(result.scalars().all())
+
+    async def read_values_in(
+        self,
+        class_table: type[T],
+        key: str,
+        values: Sequence[Any],
+        options: Sequence[Any] = (),
+    ) -> List[T]:
+        """read_values_in gets all the values whose column key is one of the values passed,
+        using a single SELECT ... WHERE key IN (...) query
+
+        # Example
+        ```python
+        sesion = SQLAlchemySQLDbAdapter()
+        users = await session.read_values_in(User, "id", [1, 2, 3])
+        ```
+
+        Parameters
+        ---
+
+        class_table type
+            this is the name of the class of the table i.e. User
+        key str
+            the column used to look up the rows i.e. "id"
+        values Sequence
+            the values of the column to look up i.e. [1, 2, 3]
+        options Sequence
+            loader options applied to the query i.e. selectinload(User.orders)
 
-    def read_all_values(self, class_table: type[T]) -> List[T]:
+        Returns
+        ---
+        result: List[T]
+            the rows found, rows which do not exist are not returned
+        """
+        result = await self.session.execute(
+            select(class_table)
+            .options(*options)
+            .where(getattr(class_table, key).in_(values))
+        )
+        return list(result.scalars().all())
+
+    async def read_all_values(
+        self, class_table: type[T], options: Sequence[Any] = ()
+    ) -> List[T]:
         """read_all_values this method will read all the values from the SQL table
 
         # Example
         ```python
         sesion = SQLAlchemySQLDbAdapter()
-        session.read_all_values(User)
+        await session.read_all_values(User)
+        await session.read_all_values(User, options=(selectinload(User.orders),))
         ```
 
         Parameters
@@ -247,15 +352,61 @@ class SQLAlchemySQLDbAdapter:
 
         class_table type
             this is the name of the class of the table i.e. User
+        options Sequence
+            loader options applied to the query i.e. selectinload(User.orders)
 
         Returns
         ---
         result: Any
         """
         # Query for all rows in the table
-        return self.session.query(class_table).all()
+        result = await self.session.execute(select(class_table).options(*options))
+        return list(result.scalars().all())
 
-    def read_all_values_with_pagination(
+    async def iter_all_values(
+        self,
+        class_table: type[T],
+        batch_size: int = 1000,
+        options: Sequence[Any] = (),
+    ) -> AsyncIterator[List[T]]:
+        """iter_all_values this method will stream all the values from the SQL table
+        in batches, such that only one batch of rows is held in memory at a time
+
+        # Example
+        ```python
+        sesion = SQLAlchemySQLDbAdapter()
+        async for users in session.iter_all_values(User, batch_size=500):
+            ...
+        ```
+
+        Parameters
+        ---
+
+        class_table type
+            this is the name of the class of the table i.e. User
+        batch_size int
+            the number of rows fetched from the database per batch
+        options Sequence
+            loader options applied to the query i.e. selectinload(User.orders)
+
+        Returns
+        ---
+        result: AsyncIterator[List[T]]
+            the rows of the table, one list of at most batch_size rows at a time
+        """
+        result = await self.session.stream_scalars(
+            select(class_table)
+            .options(*options)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            # release the server side cursor when the caller stops iterating early
+            await result.close()
+
+    async def read_all_values_with_pagination(
         self,
         class_table: type[T],
         number_of_objects_per_page: int,
@@ -266,7 +417,7 @@ class SQLAlchemySQLDbAdapter:
         # Example
         ```python
         sesion = SQLAlchemySQLDbAdapter()
-        session.read_all_values_with_pagination(User)
+        await session.read_all_values_with_pagination(User, 10, 1)
         ```
 
         Parameters
@@ -280,21 +431,18 @@ class SQLAlchemySQLDbAdapter:
         result: Any
         """
         offset_number = (current_page_number - 1) * number_of_objects_per_page
-        return (
-            self.session.query(class_table)
-            .offset(offset_number)
-            .limit(number_of_objects_per_page)
-            .all()
+        result = await self.session.execute(
+            select(class_table).offset(offset_number).limit(number_of_objects_per_page)
         )
+        return list(result.scalars().all())
 
-    def delete_all_values(self, class_table: type[T]) -> None:
-        """delete_value this method can be used to delete a specific value on the table or all the values which meet a specific condition.
-        the row can be identified with a key value pair.
+    async def delete_all_values(self, class_table: type[T]) -> None:
+        """delete_all_values this method can be used to delete all the values on the table.
 
         ## Example
         ```python
         session = SQLAlchemySQLDbAdapter()
-        session.delete_value(User,name="Paula")
+        await session.delete_all_values(User)
         ```
 
         Parameters
@@ -302,29 +450,35 @@ class SQLAlchemySQLDbAdapter:
 
         class_table type
             this is the name of the class of the table i.e. User
-        **kargs tuple
-            this is the key value pair that we want to use for our query i.e.
-            name='Paul', this will mean that we wabnt to delete all the users
-            named Paul
 
         Returns
         ---
         result: None
-        """
-        # Delete a row from the table
-        rows_to_delete = self.session.query(class_table).all()
-        for row_to_delete in rows_to_delete:
-            self.session.delete(row_to_delete)
-        self.session.commit()
 
-    def delete_value(self, class_table: type[T], **kwargs: Any) -> bool:
+        Notes
+        ---
+        the rows are deleted with a single DELETE statement, unless the table has
+        relationships that the ORM has to process on delete (cascades, or nulling the
+        foreign keys of related rows), in which case the rows are deleted one by one.
+        Use passive_deletes=True with ON DELETE CASCADE in the database to keep the
+        single statement for such tables.
+        """
+        if self._needs_orm_delete(class_table):
+            for row in await self.read_all_values(class_table):
+                await self.session.delete(row)
+        else:
+            # Delete all the rows from the table in a single statement
+            await self.session.execute(delete(class_table))
+        await self.session.commit()
+
+    async def delete_value(self, class_table: type[T], **kwargs: Any) -> bool:
         """delete_value this method can be used to delete a specific value on the table or all the values which meet a specific condition.
         the row can be identified with a key value pair.
 
         ## Example
         ```python
         session = SQLAlchemySQLDbAdapter()
-        session.delete_value(User,name="Paula")
+        await session.delete_value(User,name="Paula")
         ```
 
         Parameters
@@ -339,16 +493,40 @@ class SQLAlchemySQLDbAdapter:
 
         Returns
         ---
-        result: None
+        result: bool
+            True if at least one row was deleted, False otherwise
+
+        Notes
+        ---
+        the rows are deleted with a single DELETE statement, unless the table has
+        relationships that the ORM has to process on delete (cascades, or nulling the
+        foreign keys of related rows), in which case the rows are deleted one by one.
+        Use passive_deletes=True with ON DELETE CASCADE in the database to keep the
+        single statement for such tables.
         """
-        # Delete a row from the table
-        rows_to_delete = self.session.query(class_table).filter_by(**kwargs).all()
-        for row_to_delete in rows_to_delete:
-            self.session.delete(row_to_delete)
-        self.session.commit()
-        return (
-            True
-            if self.session.query(class_table).filter_by(**kwargs).all() == []
-            else False
+        if self._needs_orm_delete(class_table):
+            rows_to_delete = await self.read_values(class_table, **kwargs)
+            for row_to_delete in rows_to_delete:
+                await self.session.delete(row_to_delete)
+            await self.session.commit()
+            return len(rows_to_delete) > 0
+
+        # Delete the matching rows from the table in a single statement
+        result = await self.session.execute(delete(class_table).filter_by(**kwargs))
+        await self.session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def _needs_orm_delete(class_table: type[T]) -> bool:
+        """check whether deleting a row of the table relies on the ORM, i.e. a relationship
+        with a delete cascade, or a collection whose foreign keys (or association rows)
+        the ORM updates when the parent is deleted
+        """
+        return any(
+            relationship.cascade.delete
+            or (
+                relationship.direction in (ONETOMANY, MANYTOMANY)
+                and not relationship.passive_deletes
+            )
+            for relationship in inspect(class_table).relationships
         )
-
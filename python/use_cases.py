@@ -1,12 +1,28 @@
+import asyncio
+import datetime
+import decimal
+import enum
+import logging
+import os
+import sqlalchemy
+import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 from tests.examples.example_adapters import SQLAlchemySQLDbAdapter  # type: ignore
+import types
 import typing
+import uuid
 import pydantic
 import dataclasses
 from tests.devOS.generated_dao import Item  # type: ignore
 from tests.devOS.generated_schema import ItemRead  # type: ignore
 from tests.devOS.generated_schema import ReadItemsByCollectionRequest, ReadItemsByCollectionResponse  # type: ignore
 
+logger = logging.getLogger(__name__)
+
+# When DEBUG is on, any relationship which is not eager loaded raises on access
+# instead of silently emitting one SELECT per row (N+1 queries).
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
 # ======================= #
 #                         #
 #   CRUD GENERIC TYPES    #
@@ -75,6 +91,36 @@ class DeleteEntityResponse(pydantic.BaseModel):
 # ========================= #
 
 
+# types which model_dump returns unchanged, so they can be passed to the ORM as they are
+_PLAIN_SCALAR_TYPES = (
+    bool,
+    int,
+    float,
+    str,
+    datetime.datetime,
+    datetime.date,
+    datetime.time,
+    decimal.Decimal,
+    uuid.UUID,
+    enum.Enum,
+)
+
+
+def _is_plain_scalar(annotation: typing.Any) -> bool:
+    # True for the plain scalar types and their Optional (Union with None) forms
+    if annotation is type(None):
+        return True
+    if isinstance(annotation, type):
+        return issubclass(annotation, _PLAIN_SCALAR_TYPES)
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        return all(_is_plain_scalar(arg) for arg in typing.get_args(annotation))
+    return False
+
+
+# placeholder for CRUDSpec._build_orm until the first to_orm_write call
+_NOT_COMPILED: typing.Any = object()
+
+
 # NOTE: you could add this to the CRUDUseCase constructor directly,
 # but having a separate spec class makes it cleaner as you define the spec once and pass it to
 # multiple use case instances within endpoints.
@@ -101,9 +147,10 @@ class CRUDSpec(typing.Generic[TOrm, TWrite, TRead]):
         orm_model=UserORM,
         write_in=UserWrite,
         read_out=UserRead,
+        eager_rels=("posts",),  # relationships loaded with the entities
     ]()
 
-    CRUDUseCase(db_session, user_crud_spec).write_entity(...)
+    await CRUDUseCase(db_session, user_crud_spec).write_entity(...)
     ```
     """
 
@@ -112,15 +159,180 @@ class CRUDSpec(typing.Generic[TOrm, TWrite, TRead]):
     read_out: type[TRead]
 
     id_field: str = "id"
+    eager_rels: tuple[str, ...] = ()
+    read_batch_size: int = 1000
+
+    _read_adapter: pydantic.TypeAdapter = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    _build_orm: typing.Callable[[TWrite], TOrm] | None = dataclasses.field(
+        default=_NOT_COMPILED, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Build the read validator once per spec rather than once per row.
+        object.__setattr__(self, "_read_adapter", pydantic.TypeAdapter(self.read_out))
+
+    def _compile_orm_builder(self) -> typing.Callable[[TWrite], TOrm] | None:
+        # Generate a `build(dto)` function which passes the fields set on the DTO
+        # straight to the ORM constructor, skipping the model_dump dict round trip.
+        # Only column fields of plain scalar types are supported, otherwise model_dump
+        # is still used as it converts nested types, applies serializers and excluded
+        # fields, and includes extra/computed fields.
+        fields = self.write_in.model_fields
+        columns = set(sqlalchemy.inspect(self.orm_model).column_attrs.keys())
+        decorators = self.write_in.__pydantic_decorators__
+        if (
+            not set(fields) <= columns
+            or self.write_in.model_computed_fields
+            or self.write_in.model_config.get("extra") == "allow"
+            or decorators.field_serializers
+            or decorators.model_serializers
+            or any(
+                field.exclude
+                or not _is_plain_scalar(field.annotation)
+                or any(
+                    isinstance(
+                        meta, (pydantic.PlainSerializer, pydantic.WrapSerializer)
+                    )
+                    for meta in field.metadata
+                )
+                for field in fields.values()
+            )
+        ):
+            return None
+
+        source = [
+            "def build(dto):",
+            "    fields_set = dto.model_fields_set",
+            "    kwargs = {}",
+        ]
+        for name in fields:
+            source.append(f"    if {name!r} in fields_set:")
+            source.append(f"        kwargs[{name!r}] = dto.{name}")
+        source.append("    return orm_model(**kwargs)")
+        namespace: dict[str, typing.Any] = {"orm_model": self.orm_model}
+        exec("\n".join(source), namespace)
+        return namespace["build"]
+
+    def has_relationship(self, relationship: str) -> bool:
+        return relationship in sqlalchemy.inspect(self.orm_model).relationships
+
+    def relationship_loaders(self, *relationships: str) -> tuple[typing.Any, ...]:
+        # Load each relationship with one additional SELECT ... IN query.
+        return tuple(
+            sqlalchemy.orm.selectinload(getattr(self.orm_model, relationship))
+            for relationship in relationships
+        )
+
+    def read_loaders(self) -> tuple[typing.Any, ...]:
+        # Eager load the spec relationships and, in DEBUG, forbid any other lazy load.
+        loaders = self.relationship_loaders(*self.eager_rels)
+        if DEBUG:
+            return loaders + (sqlalchemy.orm.raiseload("*"),)
+        return loaders
 
     def to_orm_write(self, dto: TWrite) -> TOrm:
+        # The builder is compiled on first use rather than in __post_init__, as
+        # inspecting the columns configures the mappers, which fails while specs are
+        # created before every relationship target has been imported.
+        if self._build_orm is _NOT_COMPILED:
+            object.__setattr__(self, "_build_orm", self._compile_orm_builder())
+        if self._build_orm is not None:
+            return self._build_orm(dto)
         # Default: ORM constructor kwargs from validated DTO data.
         data = dto.model_dump(exclude_unset=True)
         return self.orm_model(**data)  # type: ignore[arg-type]
 
     def to_read(self, orm_obj: TOrm) -> TRead:
         # Validate/serialize from ORM attributes.
-        return self.read_out.model_validate(orm_obj, from_attributes=True)  # type: ignore[return-value]
+        return self._read_adapter.validate_python(orm_obj, from_attributes=True)
+
+
+# ===================== #
+#                       #
+#   READ BATCHING       #
+#                       #
+# ===================== #
+
+
+class IdBatcher(typing.Generic[TOrm, TWrite, TRead]):
+    """Coalesce concurrent reads by id of the same table into a single
+    SELECT ... WHERE id IN (...) query.
+
+    Each call to get waits up to max_delay_ms (or until max_batch ids are pending),
+    then one query is issued for all the pending ids and every caller receives its row.
+    The batcher runs its queries on its own sessions, as an AsyncSession cannot be
+    shared between concurrent requests, therefore it only sees committed data.
+
+    Example
+    -------
+    ```python
+    user_batcher = IdBatcher(SessionLocal, user_crud_spec, max_batch=64, max_delay_ms=2)
+
+    @app.get("/users/{user_id}")
+    async def read_user(user_id: int, db=Depends(get_db)):
+        use_case = CRUDUseCase(db, user_crud_spec, batcher=user_batcher)
+        return await use_case.read_entity(ReadEntityRequest(entity_id=user_id))
+    ```
+    """
+
+    def __init__(
+        self,
+        session_factory: sqlalchemy.ext.asyncio.async_sessionmaker,
+        spec: CRUDSpec[TOrm, TWrite, TRead],
+        max_batch: int = 64,
+        max_delay_ms: float = 2,
+    ):
+        self.session_factory = session_factory
+        self.spec = spec
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._pending: dict[typing.Any, list[asyncio.Future]] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def get(self, entity_id: typing.Any) -> TOrm | None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(entity_id, []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self._pending = self._pending, {}
+        # keep a reference to the task so that it is not garbage collected while running
+        batch = asyncio.ensure_future(self._read_batch(pending))
+        self._batches.add(batch)
+        batch.add_done_callback(self._batches.discard)
+
+    async def _read_batch(self, pending: dict[typing.Any, list[asyncio.Future]]):
+        try:
+            async with self.session_factory() as session:
+                rows = await SQLAlchemySQLDbAdapter(session).read_values_in(
+                    self.spec.orm_model,
+                    self.spec.id_field,
+                    list(pending),
+                    options=self.spec.read_loaders(),
+                )
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        rows_by_id = {getattr(row, self.spec.id_field): row for row in rows}
+        for entity_id, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(rows_by_id.get(entity_id))
 
 
 # =================== #
@@ -133,13 +345,15 @@ class CRUDSpec(typing.Generic[TOrm, TWrite, TRead]):
 class CRUDUseCase(typing.Generic[TOrm, TWrite, TRead]):
     def __init__(
         self,
-        db_session: sqlalchemy.orm.Session,
+        db_session: sqlalchemy.ext.asyncio.AsyncSession,
         spec: CRUDSpec[TOrm, TWrite, TRead],
+        batcher: IdBatcher[TOrm, TWrite, TRead] | None = None,
     ):
         self.db_session = SQLAlchemySQLDbAdapter(db_session)
         self.spec = spec
+        self.batcher = batcher
 
-    def write_entity(
+    async def write_entity(
         self, request: WriteEntityRequest[TWrite], entity_id: int | None = None
     ) -> WriteEntityResponse[TRead]:
         """Create or update an entity.
@@ -153,7 +367,7 @@ class CRUDUseCase(typing.Generic[TOrm, TWrite, TRead]):
         """
         if entity_id is not None:
             # Update existing entity using the adapter's update_values method
-            updated = self.db_session.update_values(
+            updated = await self.db_session.update_values(
                 self.spec.orm_model,
                 entity_id,
                 **request.entity.model_dump(exclude_unset=True),
@@ -161,51 +375,81 @@ class CRUDUseCase(typing.Generic[TOrm, TWrite, TRead]):
             if updated is None:
                 raise ValueError(f"Entity with id {entity_id} not found")
 
+            updated = await self._load_eager_rels(updated)
             result = WriteEntityResponse(entity=self.spec.to_read(updated))
-            print(f"Updated entity: {result.entity}")
+            logger.debug("Updated entity: %s", result.entity)
         else:
             # Create new entity
             orm_obj = self.spec.to_orm_write(request.entity)
-            created = self.db_session.add_value(orm_obj)
+            created = await self.db_session.add_value(orm_obj)
+            created = await self._load_eager_rels(created)
             result = WriteEntityResponse(entity=self.spec.to_read(created))
-            print(f"Created entity: {result.entity}")
+            logger.debug("Created entity: %s", result.entity)
         return result
 
-    def read_entity(self, request: ReadEntityRequest) -> ReadEntityResponse[TRead]:
-        orm_obj = self.db_session.read_value(
-            self.spec.orm_model, **{self.spec.id_field: request.entity_id}
+    async def _load_eager_rels(self, orm_obj: TOrm) -> TOrm:
+        # The rows returned by the writes do not have the spec relationships loaded,
+        # read them with the spec loaders so that to_read does not lazy load them.
+        if not self.spec.eager_rels:
+            return orm_obj
+        reloaded = await self.db_session.read_value(
+            self.spec.orm_model,
+            options=self.spec.read_loaders(),
+            **{self.spec.id_field: getattr(orm_obj, self.spec.id_field)},
         )
+        return orm_obj if reloaded is None else reloaded
+
+    async def read_entity(
+        self, request: ReadEntityRequest
+    ) -> ReadEntityResponse[TRead]:
+        if self.batcher is not None:
+            orm_obj = await self.batcher.get(request.entity_id)
+        else:
+            orm_obj = await self.db_session.read_value(
+                self.spec.orm_model,
+                options=self.spec.read_loaders(),
+                **{self.spec.id_field: request.entity_id},
+            )
         if orm_obj is None:
-            print(f"Entity with id {request.entity_id} not found")
+            logger.debug("Entity with id %s not found", request.entity_id)
             return ReadEntityResponse(entity=None)
         result = ReadEntityResponse(entity=self.spec.to_read(orm_obj))
-        print(f"Read entity: {result.entity}")
+        logger.debug("Read entity: %s", result.entity)
         return result
 
-    def read_all_entities(self) -> ReadAllEntitiesResponse[TRead]:
-        entities = self.db_session.read_all_values(self.spec.orm_model)
-        result = ReadAllEntitiesResponse(
-            entities=[self.spec.to_read(x) for x in entities]
-        )
-        print("Entities Retrieved:", len(result.entities))
+    async def read_all_entities(self) -> ReadAllEntitiesResponse[TRead]:
+        # Convert the rows batch by batch so only one batch of ORM objects is in memory
+        entities: list[TRead] = []
+        async for rows in self.db_session.iter_all_values(
+            self.spec.orm_model,
+            batch_size=self.spec.read_batch_size,
+            options=self.spec.read_loaders(),
+        ):
+            entities.extend(self.spec.to_read(x) for x in rows)
+        result = ReadAllEntitiesResponse(entities=entities)
+        logger.debug("Entities Retrieved: %d", len(result.entities))
         return result
 
-    def read_entity_relationship(
+    async def read_entity_relationship(
         self, request: ReadEntityRelationshipRequest
     ) -> ReadEntityRelationshipResponse[TRead]:
         """
         Given an entity ID and a relationship field name, return the related ORM objects
         as a list of read schema objects.
         """
-        orm_obj = self.db_session.read_value(
-            self.spec.orm_model, **{self.spec.id_field: request.entity_id}
+        if not self.spec.has_relationship(request.relationship):
+            logger.debug("Relationship '%s' not found on entity", request.relationship)
+            return ReadEntityRelationshipResponse(related_entities=[])
+        orm_obj = await self.db_session.read_value(
+            self.spec.orm_model,
+            options=self.spec.relationship_loaders(request.relationship),
+            **{self.spec.id_field: request.entity_id},
         )
         if orm_obj is None:
-            print(f"Entity with id {request.entity_id} not found")
+            logger.debug("Entity with id %s not found", request.entity_id)
             return ReadEntityRelationshipResponse(related_entities=[])
-        related = getattr(orm_obj, request.relationship, None)
+        related = getattr(orm_obj, request.relationship)
         if related is None:
-            print(f"Relationship '{request.relationship}' not found on entity")
             return ReadEntityRelationshipResponse(related_entities=[])
         # If the relationship is a list, serialize each; else, wrap in a list
         if isinstance(related, list):
@@ -216,19 +460,21 @@ class CRUDUseCase(typing.Generic[TOrm, TWrite, TRead]):
             result = ReadEntityRelationshipResponse(
                 related_entities=[self.spec.to_read(related)]
             )
-        print(
-            f"Related entities for {request.relationship}: {len(result.related_entities)}"
+        logger.debug(
+            "Related entities for %s: %d",
+            request.relationship,
+            len(result.related_entities),
         )
         return result
 
-    def delete_entity(self, request: DeleteEntityRequest) -> DeleteEntityResponse:
-        self.db_session.delete_value(
+    async def delete_entity(self, request: DeleteEntityRequest) -> DeleteEntityResponse:
+        await self.db_session.delete_value(
             self.spec.orm_model, **{self.spec.id_field: request.entity_id}
         )
         result = DeleteEntityResponse(
             message=f"Entity with id {request.entity_id} deleted successfully"
         )
-        print(result.message)
+        logger.debug(result.message)
         return result
 
 
@@ -240,5 +486,5 @@ class CRUDUseCase(typing.Generic[TOrm, TWrite, TRead]):
 
 
 class RelationshipQueryUseCase:
-    def __init__(self, session: sqlalchemy.orm.Session):
+    def __init__(self, session: sqlalchemy.ext.asyncio.AsyncSession):
         self.sql_db = SQLAlchemySQLDbAdapter(session)
@@ -1,15 +1,28 @@
 from __future__ import annotations
+import os
 import typing
-from functools import wraps
+from collections import deque
+from functools import lru_cache, wraps
 import typing
 from typing import Callable
 import pydantic
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required by the vectorised methods
+    np = None  # type: ignore[assignment]
 
 T = typing.TypeVar("T")  # Generic Type variable for items in the array
 V = typing.TypeVar("V")
 
 
+@lru_cache(maxsize=128)
+def _list_adapter(schema: typing.Type[V]) -> pydantic.TypeAdapter[typing.List[V]]:
+    # Building the validator is expensive, build it once per schema
+    return pydantic.TypeAdapter(typing.List[schema])  # type: ignore[valid-type]
+
+
 class array(typing.Generic[T]):
     """This is an array which can be used for building pipelines.
 
@@ -24,7 +37,7 @@ class array(typing.Generic[T]):
 
     # Debugging the pipeline
     debug_array = array(list(i for i in range(20)))
-    debug_array.set_debug(True)
+    array.activate_debug_mode()
     print(debug_array.reverse().insert(0, 10))
 
     # You can also initialise an empty array
@@ -65,28 +78,27 @@ class array(typing.Generic[T]):
     ```
     """
 
-    debug_active = False  # Class attribute to control debugging
+    # set by activate_debug_mode(), which is what wraps the @debug methods; setting it
+    # directly can only switch the output off again after activate_debug_mode()
+    debug_active = False
+    _process_pool: typing.Optional[ProcessPoolExecutor] = None  # apply_in_parallel
+    REPR_LIMIT = 32  # maximum number of items shown by str() and the debug output
 
     def __init__(self, *args: T) -> None:
-        if len(args) == 0:
-            self.items: typing.List[T] = []
-        elif len(args) == 1 and isinstance(
-            args[0], (list, tuple, set)
-        ):  # Check if arg is a list or tuple
-            self.items = list(args[0])  # Cast args[0] to List[T]
+        # a single list, tuple or set is unpacked into the items, other iterables
+        # (i.e. str or pydantic models) are kept as a single item
+        if len(args) == 1 and isinstance(args[0], (list, tuple, set)):
+            self.items: typing.List[T] = list(args[0])
         else:
-            self.items = [arg for arg in args]
+            self.items = list(args)
 
     def __str__(self) -> str:
-        item_strs = []
-        for item in self.items:
-            try:
-                # Attempt to convert the item to a string representation
-                item_strs.append(str(item))
-            except Exception as e:
-                # If an error occurs, append a placeholder or a simplified representation
-                item_strs.append(f"<Unrepresentable Object: {e}>")
-        return "[" + ", ".join(item_strs) + "]"
+        # only the first REPR_LIMIT items are formatted, so large arrays print quickly
+        item_strs = ", ".join(map(self.safe_repr, self.items[: self.REPR_LIMIT]))
+        hidden_items = len(self.items) - self.REPR_LIMIT
+        if hidden_items > 0:
+            return f"[{item_strs}, ... +{hidden_items} more]"
+        return f"[{item_strs}]"
 
     def __repr__(self) -> str:
         return f"""{self.items}"""
@@ -94,18 +106,29 @@ class array(typing.Generic[T]):
     @classmethod
     def activate_debug_mode(cls):
         cls.debug_active = True
+        # wrap the debuggable methods only now, so they have no overhead when debug is off
+        for name in dir(cls):
+            method = getattr(cls, name)
+            if getattr(method, "_debuggable", False) and not hasattr(
+                method, "__wrapped__"
+            ):
+                setattr(cls, name, cls.debug_wrapper(method))
 
     @staticmethod
     def debug(func):
+        # mark the method as debuggable, it is wrapped by activate_debug_mode
+        func._debuggable = True
+        return func
+
+    @staticmethod
+    def debug_wrapper(func):
         @wraps(func)
         def wrapper_debug(self: array[T], *args, **kwargs):
             if self.__class__.debug_active:
-                safe_items_str = ", ".join(self.safe_repr(item) for item in self.items)
-                print(f"[BEFORE] 🔻: {func.__name__}: [{safe_items_str}]", "\n")
+                print(f"[BEFORE] 🔻: {func.__name__}: {self}", "\n")
             result = func(self, *args, **kwargs)
             if self.__class__.debug_active:
-                safe_items_str = ", ".join(self.safe_repr(item) for item in self.items)
-                print(f"[AFTER] ✅: {func.__name__}: [{safe_items_str}]", "\n")
+                print(f"[AFTER] ✅: {func.__name__}: {self}", "\n")
             return result
 
         return wrapper_debug
@@ -128,15 +151,14 @@ class array(typing.Generic[T]):
 
     @debug
     def sum(self) -> array[T]:
+        # NOTE: the built-in sum/max already run in C, converting the list to a numpy
+        # array first is slower than the reduction itself (use map_np for numpy work)
         self.items = [sum(self.items)]  # type: ignore
         return self
 
     @debug
     def max(self, key: typing.Optional[typing.Callable[[T], bool]] = None):
-        if key:
-            self.items = [max(self.items, key=key)]
-        else:
-            self.items = [max(self.items)]  # type: ignore
+        self.items = [max(self.items, key=key)]  # type: ignore
         return self
 
     @debug
@@ -156,27 +178,37 @@ class array(typing.Generic[T]):
 
     @debug
     def validate(self, schema: typing.Type[V]) -> "array[V]":
-        validated_items: typing.List[V] = []
-        for item in self.items:
-            # Assuming each item is a dict that can be unpacked into the Pydantic model
-            try:
-                if isinstance(item, dict):
-                    validated_item = schema(**item)
-                elif isinstance(item, schema):
-                    validated_item = item
-                else:
+        # Validate all the items in one call, each item must be a dict or a schema instance
+        adapter = _list_adapter(schema)
+        try:
+            validated_items: typing.List[V] = adapter.validate_python(self.items)
+        except pydantic.ValidationError as e:
+            item_errors: typing.Dict[int, typing.List[str]] = {}
+            for error in e.errors():
+                index = typing.cast(int, error["loc"][0])
+                # only a wrong type of the item itself (not of one of its fields)
+                if len(error["loc"]) == 1 and error["type"] in (
+                    "model_type",
+                    "dataclass_type",
+                ):
+                    item = self.items[index]
                     raise TypeError(
                         f"Item must be a dict or {schema.__name__} instance, got {type(item)}"
-                    )
-                validated_items.append(validated_item)
-            except pydantic.ValidationError as e:
+                    ) from e
+                item_errors.setdefault(index, []).append(
+                    f"{'.'.join(map(str, error['loc'][1:]))}: {error['msg']}"
+                )
+            for index, messages in item_errors.items():
                 print(
                     "Validation error\n",
-                    f"Item: {item}",
-                    f"error: {e}",
+                    f"Item: {self.items[index]}",
+                    f"error: {'; '.join(messages)}",
                     "--------------\n",
                 )
-                # Handle the validation error (e.g., skip the item, raise an exception, etc.)
+            # Skip the invalid items and keep the valid ones
+            validated_items = adapter.validate_python(
+                [item for i, item in enumerate(self.items) if i not in item_errors]
+            )
         # Return a new array instance with the validated items, now typed as array[V]
         return array(*validated_items)
 
@@ -191,10 +223,46 @@ class array(typing.Generic[T]):
         return self
 
     @debug
-    def apply_in_parallel(self, foo: typing.Callable[[T], T]) -> array[T]:
-        with ThreadPoolExecutor() as executor:
-            self.items = list(executor.map(foo, self.items))
+    def map_np(self, ufunc: typing.Callable[[typing.Any], typing.Any]) -> array[T]:
+        """Apply a vectorised (NumPy) function to all the numeric items at once,
+        i.e. `array(1, 2, 3).map_np(np.sqrt)`"""
+        if np is None:
+            raise ImportError("numpy is required to use array.map_np")
+        result = np.asarray(ufunc(np.asarray(self.items)))
+        if result.ndim != 1 or len(result) != len(self.items):
+            raise ValueError(
+                f"map_np expects an element-wise function, got a result of shape {result.shape} "
+                f"for {len(self.items)} items"
+            )
+        self.items = result.tolist()
+        return self
+
+    @staticmethod
+    def _get_process_pool() -> ProcessPoolExecutor:
+        # the process pool is created once and reused across calls as starting the
+        # processes is expensive, a forked child process creates its own pool
+        if array._process_pool is None:
+            array._process_pool = ProcessPoolExecutor()
+        return array._process_pool
 
+    @debug
+    def apply_in_parallel(
+        self,
+        foo: typing.Callable[[T], T],
+        kind: typing.Literal["io", "cpu"] = "io",
+    ) -> array[T]:
+        """Apply foo to each item in parallel, use kind="io" (threads) for I/O bound
+        functions and kind="cpu" (processes) for CPU bound functions, in which case
+        foo and the items must be picklable (i.e. no lambdas)"""
+        if kind == "cpu":
+            self.items = list(self._get_process_pool().map(foo, self.items))
+        elif kind == "io":
+            # a new thread pool per call, so foo can itself call apply_in_parallel
+            # without waiting on the workers of a shared pool (deadlock)
+            with ThreadPoolExecutor() as executor:
+                self.items = list(executor.map(foo, self.items))
+        else:
+            raise ValueError(f"kind must be 'io' or 'cpu', got {kind!r}")
         return self
 
     @debug
@@ -218,21 +286,46 @@ class array(typing.Generic[T]):
 
     @debug
     def flatten(self) -> array[T]:
-        def unpack(array_of_arrays) -> typing.List[T]:
-            if not isinstance(array_of_arrays, list):
-                return [array_of_arrays]
-
-            return [item for sublist in array_of_arrays for item in unpack(sublist)]  # type: ignore
-
-        self.items = unpack(self.items)
+        # Depth first walk over the nested lists using a stack of iterators,
+        # this avoids recursion and builds a single output list
+        flat_items: typing.List[T] = []
+        stack = deque([iter(self.items)])
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, list):
+                    stack.append(iter(item))
+                    break
+                flat_items.append(item)
+            else:
+                stack.pop()
+
+        self.items = flat_items
         return self
 
     @debug
     def remove_duplicates(self) -> array[T]:
-        self.items = list(set(self.items))
+        # Keeps the first occurrence of each item, so the order of the items is preserved
+        try:
+            self.items = list(dict.fromkeys(self.items))
+        except TypeError:
+            # unhashable items (i.e. dicts or lists) are compared by equality instead
+            unique_items: typing.List[T] = []
+            for item in self.items:
+                if item not in unique_items:
+                    unique_items.append(item)
+            self.items = unique_items
         return self
 
     def build(
         self, index_of_item: typing.Optional[int] = None
     ) -> typing.Union[T, typing.List[T]]:
         return self.items if index_of_item is None else self.items[index_of_item]
+
+
+def _reset_process_pool() -> None:
+    # the pool inherited from the parent process cannot be used in a forked child
+    array._process_pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_process_pool)